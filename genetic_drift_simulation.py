@@ -40,67 +40,136 @@
 # email: adh5584@truman.edu, yz4586@truman.edu
 # ---------------------------------------------------------------------------------------------------------------
 
-import random
+import importlib.util
+
+import numpy as np
+
+# Numba is optional, and it is only imported for simulations large enough to make up for loading it
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+NUMBA_MIN_WORK = 2 * 10 ** 8 # the number of positions times generations from which the compiled kernels are used
+kernels_compiled = False # whether the kernels are compiled with Numba and used instead of NumPy
+prange = range # replaced by Numba's parallel range when the kernels are compiled
+
+# The nucleotides in the order of their encoding: 0 = A, 1 = C, 2 = T, 3 = G
+NUCLEOTIDES = np.array(list("ACTG"))
+DECODE_TABLE = bytes.maketrans(bytes(range(len(NUCLEOTIDES))), "".join(NUCLEOTIDES).encode()) # codes to letters
+
+rng = np.random.default_rng() # random number generator used for mutations
+MIN_SINGLE_PRECISION_RATE = 2.0 ** -12 # smallest mutation rate drawn with single precision random numbers
+NUM_SEEDS = 2 ** 64 # number of different seeds of the random numbers made in the compiled kernels
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15) # the step between the counters of the splitmix64 generator
 
 
 def initialize_original_sequence(population_size_N, num_of_base_pairs_L):
     '''
     This function initializes the original generation sequence with the the 
-    value 'A'.
+    value 'A'. The population is stored as a 2D array of unsigned bytes with one row
+    per haploid individual and one column per base pair. Each nucleotide is encoded as
+    its index in NUCLEOTIDES, so a population of all adenine is simply an array of zeros.
 
     :param int population_size_N: the number of haploid individuals in the population
     :param int num_of_base_pairs_L: the length of base pairs for the sequence
-    :return list initial_sequence: the original sequence of all adenine, 'A's
-    '''
-    initial_sequence = []
-    for index in range(0, population_size_N):
-        indiv_sequence = ""
-        for nucleotide in range(0, num_of_base_pairs_L):
-            indiv_sequence += "A"
-        initial_sequence.append(indiv_sequence)
+    :return numpy.ndarray initial_sequence: the (N, L) original sequence of all adenine, 'A's
+    '''
+    initial_sequence = np.zeros((population_size_N, num_of_base_pairs_L), dtype=np.uint8)
     return initial_sequence
 
 
 def reproduce(mutation_rate, prev_generation):
     '''
     This function generates every new generation of the DNA sequences based on the previous generation.
-    The mutate function is called within every generation to ensure that all new sequences are mutated
-    according to the mutation rate. The mutation rate is expected to be a decimal value between 0 and 1
+    The new generation is written over the previous one, so the same array is reused for every generation.
+    Every nucleotide of every sequence is mutated according to the mutation rate in a single vectorized step.
+    A random decimal number between 0 and 1 is drawn for each position, and the positions whose number falls
+    below the mutation rate are mutated. A mutated nucleotide is shifted by a random amount between 1 and 3
+    (wrapping around the four nucleotides), which guarantees that it becomes a different nucleotide. The shift
+    is chosen from the same random number, so only one number is drawn for each position. Once the kernels
+    are compiled by compile_kernels, the same mutations are made by a compiled kernel instead. The mutation
+    rate is expected to be a decimal value between 0 and 1
 
     :param float mutation_rate: the mutation rate per position per generation (between 0 and 1)
-    :param list prev_generation: the previous generation of sequences to reproduce with mutation
-    :return list new_generation: a list of sequences in the newly mutated population
+    :param numpy.ndarray prev_generation: the previous generation of sequences to reproduce with mutation
+    :return numpy.ndarray new_generation: the sequences in the newly mutated population (the same array)
     '''
-    new_generation = []
-    for index in range(0, len(prev_generation)):
-		# mutate each sequence in the list of each individual sequence in the generation
-        new_generation.append(mutate(mutation_rate, prev_generation[index]))
+    new_generation = prev_generation # every mutation only changes its own position, so no copy is needed
+    _mutate(mutation_rate, new_generation)
     return new_generation
 
 
-def mutate(mutation_rate, generation_sequence):
+def _mutate(mutation_rate, generation):
+    '''
+    This function makes the mutations of reproduce in place and returns how many positions were mutated,
+    so that a generation without any mutations can be recognized.
+
+    :param float mutation_rate: the mutation rate per position per generation (between 0 and 1)
+    :param numpy.ndarray generation: the (N, L) sequences to mutate in place
+    :return int num_mutations: the number of positions that were mutated
+    '''
+    if kernels_compiled:
+        return _mutate_kernel(generation, mutation_rate, rng.integers(NUM_SEEDS, dtype=np.uint64))
+
+    # single precision halves the random numbers drawn, but is too coarse for very small mutation rates
+    precision = np.float32 if mutation_rate >= MIN_SINGLE_PRECISION_RATE else np.float64
+    likelihoods = rng.random(generation.shape, dtype=precision)
+    # find the positions whose random number is in the mutation rate percentage
+    mutations = likelihoods < mutation_rate
+    # reuse the random numbers below the mutation rate to choose each shift between 1 and 3
+    shifts = 1 + np.minimum(likelihoods[mutations] * 3 / mutation_rate, 2).astype(np.uint8)
+    generation[mutations] = (generation[mutations] + shifts) & 3
+    return len(shifts)
+
+
+def seed_random(seed):
+    '''
+    This function seeds the random numbers used for mutations so that a simulation can be repeated. The
+    compiled kernels draw their seeds from this generator, so they are repeated as well, no matter how many
+    threads they run on.
+
+    :param int seed: the seed for the random number generator
+    '''
+    global rng
+    rng = np.random.default_rng(seed)
+
+
+def _splitmix64(counter):
+    '''
+    This function scrambles a 64-bit counter into a random looking 64-bit number with the splitmix64
+    generator. Random numbers are made by scrambling consecutive counters, so any number in the stream can be
+    made on its own, without a generator state to set up or share between threads.
+
+    :param numpy.uint64 counter: the counter to scramble
+    :return numpy.uint64 random_bits: the scrambled counter
     '''
-    This function mutates the sequence according to the mutation rate. A random number is generated to determine
-    which individual nucleotide in the sequence may or may not be mutated. Using the random library, a decimal number is generated between
-    0 and 1. If the random number is within a specific interval inside the mutation rate, that nucleotide is mutated. To determine
-    which nucleotide it becomes, a random choice is made from a list of C, T, and G. Because the initial sequence is assumed to be A,
-    there are no mutations to Adenine or A. 
+    random_bits = (counter ^ (counter >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    random_bits = (random_bits ^ (random_bits >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return random_bits ^ (random_bits >> np.uint64(31))
+
 
-    :param float mutation_rate: the decimal mutation rate between 0 and 1 to determine how much the sequence will be mutated
-    :param str generation_sequence: the previous generation sequence to mutate
-    :return str new_generation_sequence: the new string generation sequence to be added to the new population
+def _mutate_kernel(generation, mutation_rate, seed):
+    '''
+    This function mutates a generation in place once the kernels are compiled. Each sequence is mutated on its own
+    thread. The random numbers come from a splitmix64 stream whose starting counter is scrambled from the seed
+    and the index of the sequence, so the mutations only depend on the seed and not on which thread mutated
+    which sequence. The random number that decides whether a nucleotide is mutated is reused to choose the
+    shift, since a number below the mutation rate is still evenly spread between 0 and the mutation rate.
+
+    :param numpy.ndarray generation: the (N, L) sequences to mutate in place
+    :param float mutation_rate: the mutation rate per position per generation (between 0 and 1)
+    :param numpy.uint64 seed: the seed of the random numbers for this generation
+    :return int num_mutations: the number of positions that were mutated
     '''
-    new_generation_sequence = ""
-    nucleotide_choices = ['C', 'T', 'G']
-    for index in range(0, len(generation_sequence)):
-        likelihood = random.random() # get a random floating point number between 0 and 1
-        # if the random number is in the mutation rate percentage, mutate the nucleotides
-        if likelihood <= mutation_rate:
-            new_generation_sequence += random.choice(nucleotide_choices)
-        # if the random number is outside the percentage interval, keep the nucleotide the same
-        elif likelihood > mutation_rate:
-            new_generation_sequence += generation_sequence[index]
-    return new_generation_sequence
+    num_mutations = 0
+    for index in prange(generation.shape[0]):
+        counter = _splitmix64(seed ^ _splitmix64((np.uint64(index) + np.uint64(1)) * GOLDEN_GAMMA))
+        for position in range(generation.shape[1]):
+            counter += GOLDEN_GAMMA
+            # the top 53 bits of the random number become a decimal number between 0 and 1
+            likelihood = np.float64(_splitmix64(counter) >> np.uint64(11)) * 2.0 ** -53
+            if likelihood < mutation_rate:
+                shift = 1 + min(int(likelihood * 3 / mutation_rate), 2)
+                generation[index, position] = (generation[index, position] + shift) & 3
+                num_mutations += 1
+    return num_mutations
 
 
 def genetic_distance(generation, population_size_N, num_of_base_pairs_L):
@@ -114,41 +183,137 @@ def genetic_distance(generation, population_size_N, num_of_base_pairs_L):
     base pairs in a sequence of length 100 bp, the average genetic distance within this population would be 
     (8 + 10 + 14) / 3 × (1/100), or 0.1067.
 
-    :param int generation: the generation number from 1 to the population size (N)
+    Rather than comparing every pair of sequences, the nucleotides at each position are counted. At a position
+    where nucleotide b appears count_b times, the number of pairs that differ is (N² − Σ count_b²) / 2, so the sum
+    of the distances over all pairs is found by adding this up over every position.
+
+    :param numpy.ndarray generation: the (N, L) sequences of the population
     :param int population_size_N: The number of haploid individuals in the population
     :param int num_of_base_pairs_L: the length of the base pairs in the sequence
     :return float average_distance: The average genetic distance for this generation
     '''
-    # calculate the distance between 2 sequences
-    distances = []
-    for index in range(0, len(generation)):
-        for index2 in range(index + 1, len(generation)):
-            distances.append(compare_sequences(generation[index], generation[index2]))
-    
-    # Add the sum of the distances together
-    sum_of_distances = 0
-    for value in distances:
-        sum_of_distances += value
+    # a single sequence, or no sequence at all, has nothing to differ from
+    if len(generation) <= 1:
+        return 0.0
+
+    # count how many times each nucleotide appears at every position
+    counts = np.empty((len(NUCLEOTIDES), generation.shape[1]), dtype=np.int64)
+    for nucleotide in range(0, len(NUCLEOTIDES)):
+        counts[nucleotide] = np.count_nonzero(generation == nucleotide, axis=0)
+
+    # Add the distances between every pair of sequences together
+    num_sequences = len(generation)
+    sum_of_distances = (num_sequences * num_sequences * generation.shape[1] - int((counts * counts).sum())) // 2
 
     average_distance = (sum_of_distances / population_size_N) / num_of_base_pairs_L
 
     return average_distance
 	
 
+def simulate(mutation_rate, generation, num_generations):
+    '''
+    This function runs a population through a number of generations without stopping in between. The average
+    genetic distance of every generation is recorded before that generation reproduces, the same way it is
+    when the generations are run one at a time with genetic_distance and reproduce. Like reproduce, the
+    generation is mutated in place. If no position was mutated in a generation, the distance of the previous
+    generation is reused instead of being calculated again; this is only done here, since reproduce does not
+    report whether anything was mutated. Once the kernels are compiled, the whole loop runs inside one
+    compiled kernel; otherwise it calls genetic_distance and _mutate, the part of reproduce that reports
+    the number of mutations.
+
+    :param float mutation_rate: the mutation rate per position per generation (between 0 and 1)
+    :param numpy.ndarray generation: the (N, L) sequences of the first generation, mutated in place
+    :param int num_generations: the number of generations to run the population through
+    :return numpy.ndarray final_generation: the sequences after the last generation has reproduced
+    :return numpy.ndarray distances: the average genetic distance for each of the generations
+    '''
+    distances = np.empty(num_generations)
+    if kernels_compiled:
+        _simulate_kernel(generation, mutation_rate, distances, rng.integers(NUM_SEEDS, dtype=np.uint64))
+        return generation, distances
+
+    num_mutations = 1 # the first generation always has its distance calculated
+    for index in range(0, num_generations):
+        if num_mutations > 0:
+            distance = genetic_distance(generation, len(generation), generation.shape[1])
+        distances[index] = distance
+        num_mutations = _mutate(mutation_rate, generation)
+    return generation, distances
+
+
+def _distance_kernel(generation):
+    '''
+    This function is the compiled version of genetic_distance used by _simulate_kernel. The nucleotides at
+    each position are counted on their own thread and the differing pairs are added up over every position.
+
+    :param numpy.ndarray generation: the (N, L) sequences of the population
+    :return float average_distance: The average genetic distance for this generation
+    '''
+    num_sequences, num_of_base_pairs_L = generation.shape
+    if num_sequences <= 1:
+        return 0.0
+
+    sum_of_distances = 0
+    for position in prange(num_of_base_pairs_L):
+        counts = np.zeros(4, dtype=np.int64)
+        for index in range(num_sequences):
+            counts[generation[index, position]] += 1
+        sum_of_distances += (num_sequences * num_sequences - (counts * counts).sum()) // 2
+    return (sum_of_distances / num_sequences) / num_of_base_pairs_L
+
+
+def _simulate_kernel(generation, mutation_rate, distances, seed):
+    '''
+    This function runs the loop of simulate in place once the kernels are compiled. One generation is run for every
+    entry of distances, which is filled with the average genetic distance of that generation. The seed of each
+    generation is scrambled from the seed and the index of the generation.
+
+    :param numpy.ndarray generation: the (N, L) sequences of the first generation, mutated in place
+    :param float mutation_rate: the mutation rate per position per generation (between 0 and 1)
+    :param numpy.ndarray distances: the preallocated average genetic distance for each generation
+    :param numpy.uint64 seed: the seed of the random numbers for the whole simulation
+    '''
+    distance = 0.0
+    num_mutations = 1 # the first generation always has its distance calculated
+    for index in range(len(distances)):
+        if num_mutations > 0:
+            distance = _distance_kernel(generation)
+        distances[index] = distance
+        generation_seed = _splitmix64(seed ^ _splitmix64((np.uint64(index) + np.uint64(1)) * GOLDEN_GAMMA))
+        num_mutations = _mutate_kernel(generation, mutation_rate, generation_seed)
+
+
+def compile_kernels():
+    '''
+    This function imports Numba and compiles the kernels, after which reproduce and simulate use them instead
+    of NumPy. Each kernel is compiled the first time it is called and cached on disk, so later runs of the
+    program only load it. Loading Numba and the kernels takes a moment, which only pays off for large
+    simulations, so main only calls this function from NUMBA_MIN_WORK positions times generations.
+    '''
+    global prange, _splitmix64, _mutate_kernel, _distance_kernel, _simulate_kernel, kernels_compiled
+    if kernels_compiled:
+        return
+    import numba
+    prange = numba.prange
+    _splitmix64 = numba.njit(cache=True)(_splitmix64)
+    _mutate_kernel = numba.njit(parallel=True, cache=True)(_mutate_kernel)
+    _distance_kernel = numba.njit(parallel=True, cache=True)(_distance_kernel)
+    _simulate_kernel = numba.njit(cache=True)(_simulate_kernel)
+    kernels_compiled = True
+
+
 def compare_sequences(sequence1, sequence2):
     '''
     This function compares two sequences and returns the number of different chars between the two.
     For this program, this function would compare two sequences in a generation of a population and
     returns the distance between the two. It is assumed that the two sequences are the same length.
+    The encoded nucleotides of two sequences are XORed together, which is nonzero exactly where they differ.
 
-    :param str sequence1: the first string of nucleotides to compare
-    :param str sequence2: the second string of nucleotides to compare
+    :param numpy.ndarray sequence1: the first sequence of nucleotides to compare
+    :param numpy.ndarray sequence2: the second sequence of nucleotides to compare
     :return int num_differences: the number of differences between the two sequences, the distance
     '''
-    num_differences = 0
-    for index in range(0, len(sequence1)):
-        if sequence1[index] != sequence2[index]:
-            num_differences += 1
+    num_differences = np.count_nonzero(np.bitwise_xor(sequence1, sequence2))
     return num_differences
 
 
@@ -158,18 +323,15 @@ def split_populations(generation_sequence, population_size_N):
     The first sequence will contain the first half of the previous generation's
     N values. The second will contain the second half of the previous generation's N values.
     It is assumed that the population size, N will be even. If it isn't the first sequence
-    will contain one more haploid sequence than the second.
+    will contain one more haploid sequence than the second. Both populations are views
+    into the previous generation, so no sequences are copied.
 
-    :param list generation sequence: the previous generation sequence to split
+    :param numpy.ndarray generation sequence: the previous generation sequence to split
     :param int population_size_N: the population size of the population generation
     '''
-    population1= []
-    population2 = []
-    for index in range(0, len(generation_sequence)):
-        if index < population_size_N / 2:
-            population1.append(generation_sequence[index])
-        else:
-            population2.append(generation_sequence[index])
+    half = (population_size_N + 1) // 2
+    population1 = generation_sequence[:half]
+    population2 = generation_sequence[half:]
     return population1, population2
 
 
@@ -200,12 +362,13 @@ def print_output(avg_distance, generations):
 
 def display(sequence):
     '''
-    This function prints the contents of an array, or an individual sequence, to the screen
+    This function prints the contents of an array, or an individual sequence, to the screen.
+    The encoded nucleotides are decoded back into their letters with a precomputed translation table.
 
-    :param list sequence: the sequence to be displayed to the screen
+    :param numpy.ndarray sequence: the sequence to be displayed to the screen
     '''
     for index in range(0, len(sequence)):
-        print("\t" + str(sequence[index]))
+        print("\t" + sequence[index].tobytes().translate(DECODE_TABLE).decode())
 
 
 def print_instructions():
@@ -244,6 +407,29 @@ def print_instructions():
     print("Enter the requested data when prompted below to begin. \n")
 
 
+def prompt_for_value(prompt, retry_prompt, convert, is_valid):
+    '''
+    This function prompts the user for a value until a valid one is entered. The input is converted once
+    and the converted value is checked, so input that cannot be converted, e.g. a letter when a number is
+    expected, is asked for again instead of stopping the program.
+
+    :param str prompt: the message shown when first asking for the value
+    :param str retry_prompt: the message shown when asking again after an invalid value
+    :param function convert: the function converting the inputted string to the expected type
+    :param function is_valid: the function returning whether the converted value is acceptable
+    :return value: the converted value that was entered
+    '''
+    user_input = input(prompt)
+    while True:
+        try:
+            value = convert(user_input)
+            if is_valid(value):
+                return value
+        except ValueError:
+            pass
+        user_input = input(retry_prompt)
+
+
 def main():
     '''
     The main function prints the program overview and instructions to the user and then prompts the user
@@ -257,39 +443,32 @@ def main():
     print_instructions()
     # Get the user input
     # Check that the input matches the expected values and biologically plausible values (N >0, ect…)
-    population_size_N = input("Please enter a population size (N): ")
-    while int(population_size_N) <= 0:
-        population_size_N = input("Please enter a valid population size greater than 0 (N): ")
+    population_size_N = prompt_for_value("Please enter a population size (N): ",
+        "Please enter a valid population size greater than 0 (N): ", int, lambda value: value > 0)
 
-    num_of_base_pairs_L = input("Please enter length of base pairs (L): ")
-    while int(num_of_base_pairs_L) <= 0:
-        num_of_base_pairs_L = input("Please enter a valid length of base pairs greater than 0 (L): ")
+    num_of_base_pairs_L = prompt_for_value("Please enter length of base pairs (L): ",
+        "Please enter a valid length of base pairs greater than 0 (L): ", int, lambda value: value > 0)
 
-    mutation_rate = input("Please enter mutation rate (between 0 and 1): ")
-    while float(mutation_rate) < 0 or float(mutation_rate) > 1:
-        mutation_rate = input("Please enter a valid mutation rate (between 0 and 1): ")
+    mutation_rate = prompt_for_value("Please enter mutation rate (between 0 and 1): ",
+        "Please enter a valid mutation rate (between 0 and 1): ", float, lambda value: 0 <= value <= 1)
 
-    generation_g = input("Please enter generation g: ")
-    while int(generation_g) <= 0:
-        generation_g = input("Please enter a valid generation g that is greater than 0: ")
+    generation_g = prompt_for_value("Please enter generation g: ",
+        "Please enter a valid generation g that is greater than 0: ", int, lambda value: value > 0)
 
-    total_generations_G = input("Please enter num of generations: ")
-    while int(total_generations_G) <= 0:
-        total_generations_G = input("Please enter num of generations that is less than generation g and greater than 0: ")
+    total_generations_G = prompt_for_value("Please enter num of generations: ",
+        "Please enter num of generations that is less than generation g and greater than 0: ", int,
+        lambda value: value > 0)
 
-    list_all_generations = input("Would you like to see all of the generations' genotypes (Y or N): ")
-    while list_all_generations.upper() != 'Y' and list_all_generations.upper() != 'N':
-        list_all_generations = input("Please enter a valid input indicating yes or no (Y or N): ")
+    list_all_generations = prompt_for_value("Would you like to see all of the generations' genotypes (Y or N): ",
+        "Please enter a valid input indicating yes or no (Y or N): ", str.upper, lambda value: value in ('Y', 'N'))
 
-    # Convert the input from strings to the correct values
-    population_size_N = int(population_size_N)
-    num_of_base_pairs_L = int(num_of_base_pairs_L)
-    mutation_rate = float(mutation_rate)
-    generation_g = int(generation_g)
-    total_generations_G = int(total_generations_G)
+    verbose = list_all_generations == 'Y' # whether every generation's genotypes are displayed
+
+    if NUMBA_AVAILABLE and population_size_N * num_of_base_pairs_L * total_generations_G >= NUMBA_MIN_WORK:
+        compile_kernels()
 
     # Initialize the initial generation with all ‘A’s
-    initial_sequence = initialize_original_sequence(int(population_size_N), int(num_of_base_pairs_L))
+    initial_sequence = initialize_original_sequence(population_size_N, num_of_base_pairs_L)
 
     avg_genetic_distances = [] # The average genetic distances for each generation
     generations = [] # A list of all the generation numbers
@@ -297,61 +476,90 @@ def main():
 
     if generation_g < total_generations_G:
         new_generation_sequence = initial_sequence
-        for generation in range(0, generation_g):
-            generations.append(generation_number)
-            avg_genetic_distances.append(genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L))
-            if list_all_generations.upper() == 'Y':
+        if verbose:
+            for generation in range(0, generation_g):
+                generations.append(generation_number)
+                distance = genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L)
+                avg_genetic_distances.append(distance)
                 print('-------- Generation: ' + str(generation_number) + ' --------\n')
                 display(new_generation_sequence)
-                print("Average genetic distance: " + str(genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L)) + "\n")
-            new_generation_sequence = reproduce(mutation_rate, new_generation_sequence)
-            generation_number += 1
+                print("Average genetic distance: " + str(distance) + "\n")
+                new_generation_sequence = reproduce(mutation_rate, new_generation_sequence)
+                generation_number += 1
+        else:
+            # no generation is displayed, so every generation before the split is run at once
+            new_generation_sequence, distances = simulate(mutation_rate, new_generation_sequence, generation_g)
+            for distance in distances:
+                generations.append(generation_number)
+                avg_genetic_distances.append(distance)
+                generation_number += 1
 
         # Create 2 new positions with size N/2
         population1, population2 = split_populations(new_generation_sequence, population_size_N)
-        for generation in range(generation_g, total_generations_G):
-            generations.append(generation_number)
-            avg_genetic_distances.append(genetic_distance(population1, population_size_N / 2, num_of_base_pairs_L))
-            if list_all_generations.upper() == "Y":
+        population1_size, population2_size = len(population1), len(population2)
+        if verbose:
+            for generation in range(generation_g, total_generations_G):
+                generations.append(generation_number)
+                distance = genetic_distance(population1, population1_size, num_of_base_pairs_L)
+                avg_genetic_distances.append(distance)
                 print('-------- Generation: ' + str(generation_number) + ' --------\n')
                 print("Population 1: ")
                 display(population1)
-                print("Average genetic distance: " + str(genetic_distance(population1, population_size_N / 2, num_of_base_pairs_L)) + "\n")
-            new_generation_sequence = reproduce(mutation_rate, population1)
+                print("Average genetic distance: " + str(distance) + "\n")
+                population1 = reproduce(mutation_rate, population1)
 
-            generations.append(generation_number)
-            avg_genetic_distances.append(genetic_distance(population2, population_size_N / 2, num_of_base_pairs_L))
-            if list_all_generations.upper() == "Y":
+                generations.append(generation_number)
+                distance = genetic_distance(population2, population2_size, num_of_base_pairs_L)
+                avg_genetic_distances.append(distance)
                 print("Polulation 2: ")
                 display(population2)
-                print("Average genetic distance: " + str(genetic_distance(population2, population_size_N / 2, num_of_base_pairs_L)) +"\n")
-            new_generation_sequence = reproduce(mutation_rate, population2)
+                print("Average genetic distance: " + str(distance) +"\n")
+                population2 = reproduce(mutation_rate, population2)
 
-            generation_number += 1
-        if list_all_generations.upper() == "N":
-                print('\n-------- Generation: ' + str(generation_number - 1) + ' --------\n')
-                print("Population 1: ")
-                display(population1)
-                print("Average genetic distance: " + str(genetic_distance(population1, population_size_N / 2, num_of_base_pairs_L)) +"\n")
-                print("\n")
-                print("Polulation 2: ")
-                display(population2)
-                print("Average genetic distance: " + str(genetic_distance(population2, population_size_N / 2, num_of_base_pairs_L)) +"\n")
+                generation_number += 1
+        else:
+            # the two populations evolve independently, so each one is run through every generation at once
+            population1, distances1 = simulate(mutation_rate, population1, total_generations_G - generation_g)
+            population2, distances2 = simulate(mutation_rate, population2, total_generations_G - generation_g)
+            for index in range(0, total_generations_G - generation_g):
+                generations.append(generation_number)
+                avg_genetic_distances.append(distances1[index])
+                generations.append(generation_number)
+                avg_genetic_distances.append(distances2[index])
+                generation_number += 1
+
+            print('\n-------- Generation: ' + str(generation_number - 1) + ' --------\n')
+            print("Population 1: ")
+            display(population1)
+            print("Average genetic distance: " + str(genetic_distance(population1, population1_size, num_of_base_pairs_L)) +"\n")
+            print("\n")
+            print("Polulation 2: ")
+            display(population2)
+            print("Average genetic distance: " + str(genetic_distance(population2, population2_size, num_of_base_pairs_L)) +"\n")
 
     # complete reproduction process from 0 to G
     else:
         generation_number = 1
         new_generation_sequence = initial_sequence
-        for generation in range(0, total_generations_G):
-            print('-------- Generation: ' + str(generation_number) + ' --------\n')
-            generations.append(generation_number)
-            if list_all_generations.upper() == "Y":
+        if verbose:
+            for generation in range(0, total_generations_G):
+                print('-------- Generation: ' + str(generation_number) + ' --------\n')
+                generations.append(generation_number)
                 display(new_generation_sequence)
-            avg_genetic_distances.append(genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L))
-            print("Average genetic distance: " + str(genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L)) +"\n")
-            new_generation_sequence = reproduce(mutation_rate, new_generation_sequence)
-            generation_number += 1
-        if list_all_generations.upper() == "N":
+                distance = genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L)
+                avg_genetic_distances.append(distance)
+                print("Average genetic distance: " + str(distance) +"\n")
+                new_generation_sequence = reproduce(mutation_rate, new_generation_sequence)
+                generation_number += 1
+        else:
+            new_generation_sequence, distances = simulate(mutation_rate, new_generation_sequence, total_generations_G)
+            for distance in distances:
+                print('-------- Generation: ' + str(generation_number) + ' --------\n')
+                generations.append(generation_number)
+                avg_genetic_distances.append(distance)
+                print("Average genetic distance: " + str(distance) +"\n")
+                generation_number += 1
+
             print('\n-------- Generation: ' + str(generation_number - 1) + ' --------\n')
             display(new_generation_sequence)
             print("Average genetic distance: " + str(genetic_distance(new_generation_sequence, population_size_N, num_of_base_pairs_L)) +"\n")
@@ -0,0 +1,166 @@
+import os
+import subprocess
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+import genetic_drift_simulation as simulation
+
+
+class TestGeneticDistance(unittest.TestCase):
+
+    def test_matches_pairwise_comparison(self):
+        generator = np.random.default_rng(0)
+        for population_size_N, num_of_base_pairs_L in [(1, 5), (2, 3), (7, 13), (50, 40)]:
+            generation = generator.integers(0, 4, (population_size_N, num_of_base_pairs_L), dtype=np.uint8)
+            sum_of_distances = sum(simulation.compare_sequences(generation[index], generation[index2])
+                for index in range(population_size_N) for index2 in range(index + 1, population_size_N))
+            self.assertEqual(simulation.genetic_distance(generation, population_size_N, num_of_base_pairs_L),
+                (sum_of_distances / population_size_N) / num_of_base_pairs_L)
+
+    @unittest.skipUnless(simulation.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_distance_kernel_matches_genetic_distance(self):
+        simulation.compile_kernels()
+        generator = np.random.default_rng(1)
+        for trial in range(300):
+            generation = generator.integers(0, 4, (10, 100), dtype=np.uint8)
+            self.assertEqual(simulation._distance_kernel(generation), simulation.genetic_distance(generation, 10, 100))
+
+
+# Runs a seeded simulation twice in a fresh interpreter and prints whether both runs were the same
+REPEAT_SEEDED_SIMULATION = '''
+import genetic_drift_simulation as simulation
+simulation.compile_kernels()
+runs = []
+for run in range(2):
+    simulation.seed_random(1)
+    generation, distances = simulation.simulate(0.01, simulation.initialize_original_sequence(400, 500), 30)
+    simulation.reproduce(0.01, generation)
+    runs.append((generation, distances))
+print((runs[0][0] == runs[1][0]).all() and (runs[0][1] == runs[1][1]).all())
+'''
+
+
+class TestSeedRandom(unittest.TestCase):
+
+    def test_seeded_simulations_repeat(self):
+        runs = []
+        for run in range(2):
+            simulation.seed_random(1)
+            generation, distances = simulation.simulate(0.05, simulation.initialize_original_sequence(20, 30), 10)
+            simulation.reproduce(0.05, generation)
+            runs.append((generation, distances))
+        np.testing.assert_array_equal(runs[0][0], runs[1][0])
+        np.testing.assert_array_equal(runs[0][1], runs[1][1])
+
+    @unittest.skipUnless(simulation.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_seeded_simulations_repeat_on_several_threads(self):
+        environment = dict(os.environ, NUMBA_NUM_THREADS="4", NUMBA_THREADING_LAYER="workqueue",
+            PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", REPEAT_SEEDED_SIMULATION], env=environment,
+            capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "True")
+
+
+class TestSimulate(unittest.TestCase):
+
+    # low enough that many generations of a (5, 5) population have no mutations at all
+    MUTATION_RATE = 0.02
+
+    def test_matches_generations_run_one_at_a_time(self):
+        with mock.patch.object(simulation, "kernels_compiled", False):
+            simulation.seed_random(3)
+            generation = simulation.initialize_original_sequence(5, 5)
+            generation, distances = simulation.simulate(self.MUTATION_RATE, generation, 40)
+
+            simulation.seed_random(3)
+            expected_generation = simulation.initialize_original_sequence(5, 5)
+            expected_distances = []
+            for index in range(40):
+                expected_distances.append(simulation.genetic_distance(expected_generation, 5, 5))
+                simulation.reproduce(self.MUTATION_RATE, expected_generation)
+        self.assertGreater(len(set(expected_distances)), 1)
+        self.assertIn(0, np.diff(expected_distances[1:])) # some generations reuse the previous distance
+        np.testing.assert_array_equal(distances, expected_distances)
+        np.testing.assert_array_equal(generation, expected_generation)
+
+    @unittest.skipUnless(simulation.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_simulate_kernel_matches_kernels_run_one_at_a_time(self):
+        simulation.compile_kernels()
+        simulation.seed_random(3)
+        generation = simulation.initialize_original_sequence(5, 5)
+        generation, distances = simulation.simulate(self.MUTATION_RATE, generation, 40)
+
+        simulation.seed_random(3)
+        seed = simulation.rng.integers(simulation.NUM_SEEDS, dtype=np.uint64)
+        expected_generation = simulation.initialize_original_sequence(5, 5)
+        expected_distances = []
+        for index in range(40):
+            expected_distances.append(simulation._distance_kernel(expected_generation))
+            # the same seed for each generation as _simulate_kernel
+            with np.errstate(over="ignore"):
+                counter = (np.uint64(index) + np.uint64(1)) * simulation.GOLDEN_GAMMA
+            generation_seed = np.uint64(simulation._splitmix64(seed ^ np.uint64(simulation._splitmix64(counter))))
+            simulation._mutate_kernel(expected_generation, self.MUTATION_RATE, generation_seed)
+        self.assertGreater(len(set(expected_distances)), 1)
+        self.assertIn(0, np.diff(expected_distances[1:]))
+        np.testing.assert_array_equal(distances, expected_distances)
+        np.testing.assert_array_equal(generation, expected_generation)
+
+
+class TestPromptForValue(unittest.TestCase):
+
+    def test_asks_again_until_the_value_is_valid(self):
+        with mock.patch("builtins.input", side_effect=["x", "-1", "3"]) as user_input:
+            value = simulation.prompt_for_value("Population: ", "Valid population: ", int, lambda value: value > 0)
+        self.assertEqual(value, 3)
+        self.assertEqual(user_input.call_args_list,
+            [mock.call("Population: "), mock.call("Valid population: "), mock.call("Valid population: ")])
+
+
+class TestMain(unittest.TestCase):
+
+    def run_main(self, user_input):
+        '''
+        Runs main with the given user input and returns the average genetic distances passed to print_output,
+        the two populations right after the split, and the two populations that were displayed last.
+        '''
+        split = []
+        displayed = []
+        distances = []
+        original_split_populations = simulation.split_populations
+
+        def split_populations(generation_sequence, population_size_N):
+            population1, population2 = original_split_populations(generation_sequence, population_size_N)
+            split.extend([population1.copy(), population2.copy()])
+            return population1, population2
+
+        with mock.patch("builtins.input", side_effect=user_input), \
+                mock.patch.object(simulation, "split_populations", split_populations), \
+                mock.patch.object(simulation, "display", lambda sequence: displayed.append(sequence.copy())), \
+                mock.patch.object(simulation, "print_output", lambda avg_distance, generations:
+                    distances.extend(avg_distance)), \
+                redirect_stdout(io.StringIO()):
+            simulation.main()
+        return distances, split, displayed[-2:]
+
+    def test_both_populations_evolve_after_the_split(self):
+        for list_all_generations in ["Y", "N"]:
+            with self.subTest(list_all_generations=list_all_generations):
+                simulation.seed_random(2)
+                distances, split, displayed = self.run_main(["6", "50", "0.2", "2", "8", list_all_generations])
+                # the first 2 generations are before the split, then populations 1 and 2 alternate
+                distances1, distances2 = distances[2::2], distances[3::2]
+                self.assertEqual(len(distances1), 6)
+                self.assertGreater(len(set(distances1)), 1)
+                self.assertGreater(len(set(distances2)), 1)
+                self.assertFalse(np.array_equal(split[0], displayed[0]))
+                self.assertFalse(np.array_equal(split[1], displayed[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()